@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+Vitfix Artisan Store — merge, dedupe and pack the raw artisan datasets
+Streams the filtered PT datasets and data/*-marseille.json, normalizes names,
+phones and cities, merges duplicates across sources through a blocking index
+(raw PT snapshots only fill in missing fields) and writes one compact
+columnar file that deck scripts memory-map and query.
+
+Usage:
+    python scripts/artisan_store.py build [--data data/] [-o data/artisans.store]
+    python scripts/artisan_store.py query [--trade plombier] [--city marseille] [-n 10]
+"""
+
+from difflib import SequenceMatcher
+from array import array
+import argparse
+import glob
+import json
+import math
+import mmap
+import os
+import re
+import sys
+import unicodedata
+
+# ═══════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, 'data')
+STORE_FILE = os.path.join(DATA_DIR, 'artisans.store')
+# Artisans the filter step kept are the ones decks count; raw and enriched
+# scraper snapshots still hold the rejected profiles and are only used to
+# complete phones, addresses and ratings of kept artisans
+KEPT_PATTERNS = ('artisans-PT-filtered.json', 'artisans-PT-final.json', '*-marseille.json')
+SUPPLEMENT_PATTERNS = ('artisans-PT-*-raw.json', 'artisans-PT-enriched.json')
+AUTO_REJECT_SCORE = 1      # scraper _score of auto-rejected profiles
+REVIEWED_FILE = 'artisans-PT-final.json'   # manual review, supersedes -filtered
+
+MAGIC = b'VFXART1\0'
+CHUNK_SIZE = 1 << 16
+NAME_MATCH_RATIO = 0.92
+MAX_BLOCK_SIZE = 200       # larger blocks are too generic to compare pairwise
+
+LEGAL_FORMS = re.compile(
+    r'\b(lda|limitada|unipessoal|sociedade|s\.?a|sarl|sas|sasu|eurl|sci|ei|ets|etablissements?)\b\.?')
+COUNTRY_PREFIX = {'FR': '33', 'PT': '351'}
+
+
+# ═══════════════════════════════════════════════════
+# STEP 1: STREAMING PARSE
+# ═══════════════════════════════════════════════════
+
+def iter_json_records(path, array_key='profiles'):
+    """Yield the objects of a JSON records array without loading the file.
+
+    Handles both a top-level array and an object holding the array under
+    `array_key`; only a chunk plus the record being decoded is kept in memory.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding='utf-8') as f:
+        buf = f.read(CHUNK_SIZE)
+        pos = 0
+        eof = not buf
+
+        def fill():
+            # Drop what has been consumed, then append the next chunk
+            nonlocal buf, pos, eof
+            more = f.read(CHUNK_SIZE)
+            eof = not more
+            buf = buf[pos:] + more
+            pos = 0
+
+        # Locate the opening bracket of the records array
+        pattern = re.compile(r'^\s*\[|"%s"\s*:\s*\[' % re.escape(array_key))
+        while True:
+            m = pattern.search(buf)
+            if m:
+                pos = m.end()
+                break
+            if eof:
+                return
+            fill()
+
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                pos += 1
+            if pos >= len(buf):
+                if eof:
+                    return
+                fill()
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            yield record
+            pos = end
+
+
+# ═══════════════════════════════════════════════════
+# STEP 2: NORMALIZE
+# ═══════════════════════════════════════════════════
+
+def strip_accents(s):
+    s = unicodedata.normalize('NFKD', s)
+    return ''.join(c for c in s if not unicodedata.combining(c))
+
+
+def slugify(s):
+    """'Vila Nova de Gaia' -> 'vila-nova-de-gaia', 'Électricien' -> 'electricien'."""
+    return re.sub(r'[^a-z0-9]+', '-', strip_accents(s or '').lower()).strip('-')
+
+
+def name_key(name):
+    """Comparison key for company names: no accents, case, legal form or punctuation."""
+    s = strip_accents(name or '').lower()
+    s = LEGAL_FORMS.sub(' ', s)
+    return re.sub(r'[^a-z0-9]', '', s)
+
+
+def normalize_phone(phone, country):
+    """Return the phone in +<country><national> form, or '' if unusable."""
+    if not phone:
+        return ''
+    digits = re.sub(r'\D', '', str(phone))
+    prefix = COUNTRY_PREFIX.get(country, '')
+    if digits.startswith('00'):
+        digits = digits[2:]
+    if prefix and digits.startswith(prefix) and len(digits) > len(prefix) + 8:
+        return '+' + digits
+    if country == 'FR' and len(digits) == 10 and digits.startswith('0'):
+        return '+33' + digits[1:]
+    if country == 'FR' and len(digits) == 9:
+        return '+33' + digits
+    if country == 'PT' and len(digits) == 9:
+        return '+351' + digits
+    return '+' + digits if len(digits) >= 8 else ''
+
+
+class Artisan:
+    """One normalized (or merged) artisan record."""
+
+    __slots__ = ('name', 'name_key', 'phone', 'address', 'city', 'city_key',
+                 'country', 'trades', 'sources', 'rating', 'reviews', 'kept')
+
+    def __init__(self, name, phone, address, city, country, trades, sources,
+                 rating=None, reviews=0, kept=True):
+        self.name = (name or '').strip()
+        self.name_key = name_key(self.name)
+        self.phone = normalize_phone(phone, country)
+        self.address = (address or '').strip()
+        self.city = (city or '').strip()
+        self.city_key = slugify(self.city)
+        self.country = country
+        self.trades = trades
+        self.sources = sources
+        self.rating = rating
+        self.reviews = reviews or 0
+        self.kept = kept
+
+    def merge(self, other):
+        """Fold a duplicate into this record, keeping the best data of each.
+
+        A record outside the kept set only fills in missing contact details
+        and ratings; its trades and source are not counted.
+        """
+        if other.kept:
+            self.trades |= other.trades
+            self.sources |= other.sources
+            self.kept = True
+        self.phone = self.phone or other.phone
+        self.address = self.address or other.address
+        if other.rating is not None and (self.rating is None or other.reviews > self.reviews):
+            self.rating = other.rating
+            self.reviews = other.reviews
+
+    def __repr__(self):
+        return f'Artisan({self.name!r}, {self.city!r}, {sorted(self.trades)})'
+
+
+def normalize_profile(raw, source, kept=True):
+    """Map a scraped PT profile or a Marseille listing entry to an Artisan."""
+    if 'nom_entreprise' in raw:
+        return Artisan(raw['nom_entreprise'], raw.get('telephone_pro'), raw.get('adresse'),
+                       raw.get('ville'), 'FR', {slugify(raw.get('metier'))}, {source},
+                       raw.get('google_note'), raw.get('google_avis'), kept)
+    # -final still lists the profiles the scraper auto-rejected, by score
+    kept = kept and raw.get('_score', AUTO_REJECT_SCORE + 1) > AUTO_REJECT_SCORE
+    return Artisan(raw.get('company_name'), raw.get('phone'), raw.get('company_address'),
+                   raw.get('city'), raw.get('country') or 'PT',
+                   {slugify(c) for c in raw.get('categories') or []}, {source},
+                   raw.get('rating_avg'), raw.get('rating_count'), kept)
+
+
+def iter_sources(data_dir):
+    """Yield normalized artisans from every dataset, one file at a time.
+
+    Records of the kept datasets come first, flagged `kept`; supplement
+    snapshots follow with `kept` False. Profiles of a source covered by the
+    manual review but absent from it were excluded there and are not kept.
+    """
+    reviewed = {}
+    reviewed_path = os.path.join(data_dir, REVIEWED_FILE)
+    if os.path.exists(reviewed_path):
+        for raw in iter_json_records(reviewed_path):
+            reviewed.setdefault(raw.get('source_name'), set()).add(name_key(raw.get('company_name')))
+
+    for patterns, kept in ((KEPT_PATTERNS, True), (SUPPLEMENT_PATTERNS, False)):
+        for pattern in patterns:
+            for path in sorted(glob.glob(os.path.join(data_dir, pattern))):
+                source = os.path.splitext(os.path.basename(path))[0]
+                for raw in iter_json_records(path):
+                    artisan = normalize_profile(raw, source, kept)
+                    if not artisan.name_key:
+                        continue
+                    names = reviewed.get(raw.get('source_name'))
+                    if names is not None and artisan.name_key not in names:
+                        artisan.kept = False
+                    yield artisan
+
+
+# ═══════════════════════════════════════════════════
+# STEP 3: DEDUPE (blocking index + union-find)
+# ═══════════════════════════════════════════════════
+
+def blocking_keys(a):
+    """Candidate buckets: same phone, or same city and name prefix/suffix."""
+    if a.phone:
+        yield ('phone', a.phone)
+    if a.city_key:
+        yield ('prefix', a.city_key, a.name_key[:5])
+        yield ('suffix', a.city_key, a.name_key[-5:])
+
+
+def is_duplicate(a, b):
+    if a.phone and a.phone == b.phone:
+        return True
+    if a.city_key != b.city_key:
+        return False
+    if a.name_key == b.name_key:
+        return True
+    return SequenceMatcher(None, a.name_key, b.name_key).ratio() >= NAME_MATCH_RATIO
+
+
+def dedupe(artisans):
+    """Merge duplicates, only comparing records that share a blocking key.
+
+    Returns the merged artisans whose group holds at least one kept record,
+    and the number of records read.
+    """
+    artisans = list(artisans)
+    parent = list(range(len(artisans)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    blocks = {}
+    for i, a in enumerate(artisans):
+        for key in blocking_keys(a):
+            blocks.setdefault(key, []).append(i)
+
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > MAX_BLOCK_SIZE:
+            continue
+        for x, i in enumerate(members):
+            for j in members[x + 1:]:
+                ri, rj = find(i), find(j)
+                if ri != rj and is_duplicate(artisans[i], artisans[j]):
+                    parent[rj] = ri
+
+    # Kept records go first so each group is based on one of them
+    merged = {}
+    for i in sorted(range(len(artisans)), key=lambda i: not artisans[i].kept):
+        root = find(i)
+        if root in merged:
+            merged[root].merge(artisans[i])
+        else:
+            merged[root] = artisans[i]
+    return [a for a in merged.values() if a.kept], len(artisans)
+
+
+# ═══════════════════════════════════════════════════
+# STEP 4: COLUMNAR STORE
+# ═══════════════════════════════════════════════════
+# Layout: MAGIC | u32 header length | JSON header | 8-byte aligned columns.
+# Strings are one UTF-8 blob plus u32 offsets (n + 1); cities are dictionary
+# codes (u16); trades and sources are bitmasks (u64 / u32) over the header
+# dictionaries; ratings are f32 with NaN for "no rating".
+
+def _pack_strings(values):
+    offsets = array('I', [0])
+    blob = bytearray()
+    for v in values:
+        blob += v.encode('utf-8')
+        offsets.append(len(blob))
+    return offsets, bytes(blob)
+
+
+def write_store(artisans, path):
+    """Write merged artisans to the columnar store at `path`."""
+    artisans = sorted(artisans, key=lambda a: (a.city_key, -a.reviews, a.name_key))
+    cities = sorted({a.city_key for a in artisans})
+    city_names = {}
+    for a in artisans:
+        city_names.setdefault(a.city_key, a.city)
+    trades = sorted({t for a in artisans for t in a.trades if t})
+    sources = sorted({s for a in artisans for s in a.sources})
+    if len(trades) > 64 or len(sources) > 32 or len(cities) > 0xFFFF:
+        raise ValueError('too many trades/sources/cities for the store bitmasks')
+    city_code = {c: i for i, c in enumerate(cities)}
+    trade_bit = {t: 1 << i for i, t in enumerate(trades)}
+    source_bit = {s: 1 << i for i, s in enumerate(sources)}
+
+    columns = {}
+    for field in ('name', 'phone', 'address'):
+        offsets, blob = _pack_strings(getattr(a, field) for a in artisans)
+        columns[f'{field}_offsets'] = ('I', offsets.tobytes())
+        columns[f'{field}_data'] = ('B', blob)
+    columns['country'] = ('B', bytes(1 if a.country == 'PT' else 0 for a in artisans))
+    columns['city'] = ('H', array('H', (city_code[a.city_key] for a in artisans)).tobytes())
+    columns['trades'] = ('Q', array('Q', (sum(trade_bit[t] for t in a.trades if t)
+                                          for a in artisans)).tobytes())
+    columns['sources'] = ('I', array('I', (sum(source_bit[s] for s in a.sources)
+                                           for a in artisans)).tobytes())
+    columns['rating'] = ('f', array('f', (math.nan if a.rating is None else a.rating
+                                          for a in artisans)).tobytes())
+    columns['reviews'] = ('I', array('I', (int(a.reviews) for a in artisans)).tobytes())
+
+    layout = {}
+    offset = 0
+    for name, (fmt, data) in columns.items():
+        layout[name] = {'format': fmt, 'offset': offset, 'length': len(data)}
+        offset += (len(data) + 7) // 8 * 8
+    header = json.dumps({
+        'count': len(artisans),
+        'byteorder': sys.byteorder,
+        'countries': ['FR', 'PT'],
+        'cities': cities,
+        'city_names': [city_names[c] for c in cities],
+        'trades': trades,
+        'sources': sources,
+        'columns': layout,
+    }, ensure_ascii=False).encode('utf-8')
+    data_start = (len(MAGIC) + 4 + len(header) + 7) // 8 * 8
+
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(4, 'little'))
+        f.write(header)
+        for name, (fmt, data) in columns.items():
+            f.seek(data_start + layout[name]['offset'])
+            f.write(data)
+        f.truncate(data_start + offset)
+    os.replace(tmp, path)
+    return len(artisans)
+
+
+class ArtisanStore:
+    """Read-only, memory-mapped view over a store written by write_store().
+
+    Columns are zero-copy memoryviews into the mapping, so opening the store
+    costs one header parse regardless of its size.
+    """
+
+    __slots__ = ('path', 'count', 'countries', 'cities', 'city_names', 'trades',
+                 'sources', '_file', '_mm', '_view', '_cols')
+
+    def __init__(self, path=STORE_FILE):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not an artisan store')
+        header_len = int.from_bytes(self._mm[len(MAGIC):len(MAGIC) + 4], 'little')
+        start = len(MAGIC) + 4
+        header = json.loads(self._mm[start:start + header_len].decode('utf-8'))
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError(f'{path} was written on a {header["byteorder"]}-endian machine')
+        data_start = (start + header_len + 7) // 8 * 8
+
+        self.count = header['count']
+        self.countries = header['countries']
+        self.cities = header['cities']
+        self.city_names = header['city_names']
+        self.trades = header['trades']
+        self.sources = header['sources']
+        self._view = memoryview(self._mm)
+        self._cols = {}
+        for name, col in header['columns'].items():
+            lo = data_start + col['offset']
+            self._cols[name] = self._view[lo:lo + col['length']].cast(col['format'])
+
+    def close(self):
+        # The mapping can only be closed once every exported view is released
+        for col in self._cols.values():
+            col.release()
+        self._cols = {}
+        self._view.release()
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def _string(self, field, i):
+        offsets = self._cols[f'{field}_offsets']
+        return self._cols[f'{field}_data'][offsets[i]:offsets[i + 1]].tobytes().decode('utf-8')
+
+    def _bits(self, mask, names):
+        return {n for b, n in enumerate(names) if mask >> b & 1}
+
+    def record(self, i):
+        """Materialize row `i` as an Artisan."""
+        rating = self._cols['rating'][i]
+        a = Artisan(self._string('name', i), None, self._string('address', i),
+                    self.city_names[self._cols['city'][i]],
+                    self.countries[self._cols['country'][i]],
+                    self._bits(self._cols['trades'][i], self.trades),
+                    self._bits(self._cols['sources'][i], self.sources),
+                    None if math.isnan(rating) else round(rating, 2),
+                    self._cols['reviews'][i])
+        a.phone = self._string('phone', i)
+        return a
+
+    def find(self, trade=None, city=None):
+        """Row indices matching a trade and/or city (names or slugs)."""
+        city_col = self._cols['city']
+        trade_col = self._cols['trades']
+        city_code = trade_mask = None
+        if city is not None:
+            key = slugify(city)
+            if key not in self.cities:
+                return []
+            city_code = self.cities.index(key)
+        if trade is not None:
+            key = slugify(trade)
+            if key not in self.trades:
+                return []
+            trade_mask = 1 << self.trades.index(key)
+        return [i for i in range(self.count)
+                if (city_code is None or city_col[i] == city_code)
+                and (trade_mask is None or trade_col[i] & trade_mask)]
+
+    def count_by(self, trade=None, city=None):
+        return len(self.find(trade, city))
+
+    def top(self, trade=None, city=None, n=10):
+        """Best-reviewed artisans for a trade/city, most reviews first."""
+        reviews = self._cols['reviews']
+        rows = sorted(self.find(trade, city), key=lambda i: -reviews[i])
+        return [self.record(i) for i in rows[:n]]
+
+    def trade_counts(self, city=None):
+        """{trade: number of artisans} for one city or the whole store."""
+        return {t: self.count_by(t, city) for t in self.trades}
+
+
+# ═══════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════
+
+def cmd_build(args):
+    print(f"\U0001F4E5 Streaming raw datasets from {args.data}...")
+    merged, total = dedupe(iter_sources(args.data))
+    print(f"   {total} records read, {len(merged)} unique kept artisans after dedup")
+    written = write_store(merged, args.out)
+    print(f"\U0001F4BE {written} artisans written to {args.out} ({os.path.getsize(args.out)} bytes)")
+
+
+def cmd_query(args):
+    with ArtisanStore(args.store) as store:
+        rows = store.top(args.trade, args.city, args.n)
+        print(f"\U0001F50E {store.count_by(args.trade, args.city)} artisans"
+              f" (trade={args.trade or '*'}, city={args.city or '*'})")
+        for a in rows:
+            rating = f'{a.rating:.1f}' if a.rating is not None else '-'
+            print(f"   {a.name} | {a.city} | {a.phone or '-'} | {rating} ({a.reviews} avis)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build and query the artisan store.')
+    sub = parser.add_subparsers(dest='command', required=True)
+    build = sub.add_parser('build', help='merge raw datasets into the store')
+    build.add_argument('--data', default=DATA_DIR, help='directory with the raw JSON files')
+    build.add_argument('-o', '--out', default=STORE_FILE, help='store file to write')
+    build.set_defaults(func=cmd_build)
+    query = sub.add_parser('query', help='list top artisans from the store')
+    query.add_argument('--store', default=STORE_FILE)
+    query.add_argument('--trade')
+    query.add_argument('--city')
+    query.add_argument('-n', type=int, default=10)
+    query.set_defaults(func=cmd_query)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
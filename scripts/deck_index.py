@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Vitfix Deck Index — inverted text index over generated and archived decks
+Extracts every paragraph of every .pptx under the given folders into a
+persistent inverted index, re-reading only decks whose mtime/size changed,
+and answers word, phrase and number queries with deck / slide / shape hits.
+
+Usage:
+    python scripts/deck_index.py index [~/Desktop ~/Documents ...]
+    python scripts/deck_index.py search "485 000 postes vacants"
+"""
+
+from pptx import Presentation
+import argparse
+import os
+import pickle
+import re
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pptx_text import iter_paragraphs
+
+# ═══════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════
+INDEX_FILE = os.path.expanduser('~/.vitfix-deck-index.pickle')
+DEFAULT_ROOTS = [os.path.expanduser('~/Desktop'), os.path.expanduser('~/Documents')]
+INDEX_VERSION = 2
+
+# "485 000" with a plain, no-break or narrow no-break space all index as 485000
+_THOUSANDS_SEP = re.compile(r'(?<=\d)[ \u00a0\u202f\u2009](?=\d{3}(?!\d))')
+_TOKEN = re.compile(r'\d+(?:[.,]\d+)*|\w+')
+
+
+# ═══════════════════════════════════════════════════
+# TOKENIZATION
+# ═══════════════════════════════════════════════════
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return _THOUSANDS_SEP.sub('', text.casefold())
+
+
+def tokenize(text):
+    return _TOKEN.findall(normalize(text))
+
+
+def _contains_phrase(tokens, phrase):
+    n = len(phrase)
+    first = phrase[0]
+    return any(tokens[i:i + n] == phrase
+               for i, t in enumerate(tokens) if t == first)
+
+
+# ═══════════════════════════════════════════════════
+# INDEX
+# ═══════════════════════════════════════════════════
+
+class DeckIndex:
+    """Inverted index of deck text, one document per shape (or table cell).
+
+    docs[doc_id] = (deck path, slide number, shape id, shape name, cell, text);
+    postings maps each token to the set of doc ids containing it. Decks that
+    change or disappear leave None tombstones in `docs`, which are compacted
+    away once they make up half of the list.
+    """
+
+    def __init__(self):
+        self.files = {}       # path -> (mtime, size, [doc ids])
+        self.docs = []
+        self.postings = {}
+
+    @classmethod
+    def load(cls, path):
+        index = cls()
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                data = pickle.load(f)
+            if data.get('version') == INDEX_VERSION:
+                index.files = data['files']
+                index.docs = data['docs']
+                index.postings = data['postings']
+        return index
+
+    def save(self, path):
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump({'version': INDEX_VERSION, 'files': self.files,
+                         'docs': self.docs, 'postings': self.postings},
+                        f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    # ── Updates ──────────────────────────────────────
+
+    def remove_file(self, path):
+        for doc_id in self.files.pop(path, (0, 0, []))[2]:
+            for token in set(tokenize(self.docs[doc_id][5])):
+                ids = self.postings.get(token)
+                if ids is not None:
+                    ids.discard(doc_id)
+                    if not ids:
+                        del self.postings[token]
+            self.docs[doc_id] = None
+
+    def add_file(self, path, mtime, size):
+        prs = Presentation(path)
+        texts = {}
+        # Runs are joined by paragraph.text as-is: PowerPoint freely splits a
+        # word or a number like "485 000" across several runs
+        for number, shape, cell, paragraph in iter_paragraphs(prs):
+            key = (number, shape.shape_id, shape.name, cell)
+            texts.setdefault(key, []).append(paragraph.text)
+
+        doc_ids = []
+        for (number, shape_id, name, cell), paragraphs in texts.items():
+            text = '\n'.join(paragraphs).strip()
+            if not text:
+                continue
+            doc_id = len(self.docs)
+            self.docs.append((path, number, shape_id, name, cell, text))
+            doc_ids.append(doc_id)
+            for token in set(tokenize(text)):
+                self.postings.setdefault(token, set()).add(doc_id)
+        self.files[path] = (mtime, size, doc_ids)
+
+    def compact(self):
+        """Renumber documents once tombstones make up half of the list."""
+        live = [d for d in self.docs if d is not None]
+        if len(live) * 2 > len(self.docs):
+            return
+        self.docs, self.postings = [], {}
+        files, self.files = self.files, {}
+        by_path = {}
+        for doc in live:
+            by_path.setdefault(doc[0], []).append(doc)
+        for path, (mtime, size, _) in files.items():
+            doc_ids = []
+            for doc in by_path.get(path, []):
+                doc_id = len(self.docs)
+                self.docs.append(doc)
+                doc_ids.append(doc_id)
+                for token in set(tokenize(doc[5])):
+                    self.postings.setdefault(token, set()).add(doc_id)
+            self.files[path] = (mtime, size, doc_ids)
+
+    def update(self, roots):
+        """Re-index new or modified decks under `roots`; drop deleted ones.
+
+        Returns (indexed, unchanged, removed) deck counts.
+        """
+        seen = set()
+        indexed = unchanged = 0
+        for path in iter_decks(roots):
+            seen.add(path)
+            st = os.stat(path)
+            known = self.files.get(path)
+            if known and known[0] == st.st_mtime and known[1] == st.st_size:
+                unchanged += 1
+                continue
+            self.remove_file(path)
+            try:
+                self.add_file(path, st.st_mtime, st.st_size)
+            except Exception as e:  # corrupt or password-protected decks
+                print(f"   \u26A0\uFE0F  {path}: {e}")
+                continue
+            indexed += 1
+
+        abs_roots = [os.path.abspath(os.path.expanduser(r)) for r in roots]
+        removed = [p for p in self.files if p not in seen
+                   and any(p == r or p.startswith(r.rstrip(os.sep) + os.sep) for r in abs_roots)]
+        for path in removed:
+            self.remove_file(path)
+        self.compact()
+        return indexed, unchanged, len(removed)
+
+    # ── Queries ──────────────────────────────────────
+
+    def search(self, query):
+        """Docs containing every query token, in order and adjacent."""
+        phrase = tokenize(query)
+        if not phrase:
+            return []
+        posting_sets = sorted((self.postings.get(t, set()) for t in set(phrase)), key=len)
+        candidates = set(posting_sets[0]).intersection(*posting_sets[1:])
+        hits = []
+        for doc_id in sorted(candidates):
+            doc = self.docs[doc_id]
+            # Phrases do not span paragraphs, which are stored one per line
+            if len(phrase) == 1 or any(_contains_phrase(tokenize(line), phrase)
+                                       for line in doc[5].split('\n')):
+                hits.append(doc)
+        return hits
+
+
+def iter_decks(roots):
+    """Absolute paths of every .pptx under the given files/folders."""
+    for root in roots:
+        root = os.path.abspath(os.path.expanduser(root))
+        if os.path.isfile(root):
+            if root.lower().endswith('.pptx'):
+                yield root
+            continue
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for name in filenames:
+                # ~$ files are PowerPoint lock files, not decks
+                if name.lower().endswith('.pptx') and not name.startswith('~$'):
+                    yield os.path.join(dirpath, name)
+
+
+# ═══════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════
+
+def cmd_index(args):
+    roots = args.paths or DEFAULT_ROOTS
+    index = DeckIndex.load(args.index)
+    start = time.perf_counter()
+    indexed, unchanged, removed = index.update(roots)
+    index.save(args.index)
+    print(f"\U0001F4DA {indexed} decks indexed, {unchanged} unchanged, {removed} removed "
+          f"({time.perf_counter() - start:.1f}s)")
+    print(f"   {len(index.files)} decks, {len(index.postings)} distinct terms \u2192 {args.index}")
+
+
+def cmd_search(args):
+    index = DeckIndex.load(args.index)
+    start = time.perf_counter()
+    hits = index.search(args.query)
+    elapsed = (time.perf_counter() - start) * 1000
+    decks = {h[0] for h in hits}
+    print(f"\U0001F50E \"{args.query}\": {len(hits)} shapes in {len(decks)} decks ({elapsed:.1f} ms)")
+    for path, number, shape_id, name, cell, text in hits[:args.n]:
+        where = f'slide {number}, {name} (#{shape_id})'
+        if cell is not None:
+            where += f' cell {cell[0] + 1},{cell[1] + 1}'
+        snippet = ' '.join(text.split())
+        if len(snippet) > 100:
+            snippet = snippet[:97] + '...'
+        print(f"   {path} | {where}\n      {snippet}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Index and search deck text.')
+    parser.add_argument('--index', default=INDEX_FILE, help='index file')
+    sub = parser.add_subparsers(dest='command', required=True)
+    index = sub.add_parser('index', help='(re)index decks under the given paths')
+    index.add_argument('paths', nargs='*', help=f'files or folders (default: {DEFAULT_ROOTS})')
+    index.set_defaults(func=cmd_index)
+    search = sub.add_parser('search', help='find decks quoting a phrase or number')
+    search.add_argument('query')
+    search.add_argument('-n', type=int, default=50, help='max hits to print')
+    search.set_defaults(func=cmd_search)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""
+Shape / paragraph / run traversal shared by the deck scripts
+(update-pptx.py rewrites runs, deck_index.py indexes paragraphs).
+"""
+
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+
+
+# ═══════════════════════════════════════════════════
+# SHAPE / RUN TRAVERSAL
+# ═══════════════════════════════════════════════════
+
+def iter_shape_text_frames(shapes):
+    """Yield (shape, cell, text_frame) for every text frame under `shapes`.
+
+    `cell` is the (row, col) of a table cell, or None for a shape's own text
+    frame. Group shapes are walked recursively.
+    """
+    for shape in shapes:
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            yield from iter_shape_text_frames(shape.shapes)
+            continue
+        if shape.has_text_frame:
+            yield shape, None, shape.text_frame
+        if shape.has_table:
+            for r, row in enumerate(shape.table.rows):
+                for c, cell in enumerate(row.cells):
+                    yield shape, (r, c), cell.text_frame
+
+
+def iter_paragraphs(prs):
+    """Yield (slide_number, shape, cell, paragraph) for every paragraph of a deck."""
+    for number, slide in enumerate(prs.slides, 1):
+        for shape, cell, text_frame in iter_shape_text_frames(slide.shapes):
+            for paragraph in text_frame.paragraphs:
+                yield number, shape, cell, paragraph
+
+
+def iter_text_runs(prs):
+    """Yield (slide_number, shape, cell, run) for every text run of a deck."""
+    for number, shape, cell, paragraph in iter_paragraphs(prs):
+        for run in paragraph.runs:
+            yield number, shape, cell, run
@@ -0,0 +1,377 @@
+#!/usr/bin/env python3
+"""
+Vitfix Deck Preview — Pillow slide thumbnails
+Renders a PNG per slide and a contact sheet per deck for the shapes that
+update-pptx.py produces (rectangles, rounded rectangles, solid fills, wrapped
+text, native tables, pictures) without going through PowerPoint or LibreOffice.
+
+Usage:
+    python scripts/preview-pptx.py deck1.pptx [deck2.pptx ...] -o previews/
+"""
+
+from pptx import Presentation
+from pptx.enum.dml import MSO_FILL
+from pptx.enum.shapes import MSO_SHAPE, MSO_SHAPE_TYPE
+from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
+from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import argparse
+import io
+import os
+import re
+
+# ═══════════════════════════════════════════════════
+# CONSTANTS
+# ═══════════════════════════════════════════════════
+THUMB_W = 960                  # px width of each slide PNG
+SHEET_COLS = 4
+SHEET_THUMB_W = 320
+SHEET_GAP = 16
+DEFAULT_FONT_PT = 18
+LINE_SPACING = 1.2
+
+WHITE = (0xFF, 0xFF, 0xFF)
+BLACK = (0x00, 0x00, 0x00)
+SHEET_BG = (0xE9, 0xEC, 0xEF)
+LABEL_COLOR = (0x2C, 0x3E, 0x50)
+
+FONT_CANDIDATES = {
+    False: ['/System/Library/Fonts/Supplemental/Arial.ttf', 'Arial.ttf',
+            'DejaVuSans.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'],
+    True: ['/System/Library/Fonts/Supplemental/Arial Bold.ttf', 'Arial Bold.ttf',
+           'DejaVuSans-Bold.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'],
+}
+
+_ALIGN = {PP_ALIGN.CENTER: 'center', PP_ALIGN.RIGHT: 'right'}
+
+
+# ═══════════════════════════════════════════════════
+# STEP 1: EXTRACT DRAW OPERATIONS
+# ═══════════════════════════════════════════════════
+# python-pptx objects cannot cross process boundaries, so each slide is first
+# flattened into plain tuples/dicts (in EMU) that the render workers consume.
+
+def _rgb(color_format):
+    """RGB tuple of a ColorFormat, or None for theme/unset colors."""
+    try:
+        rgb = color_format.rgb
+    except (AttributeError, TypeError):
+        return None
+    return tuple(rgb) if rgb is not None else None
+
+
+def _fill_rgb(fill):
+    try:
+        if fill.type == MSO_FILL.SOLID:
+            return _rgb(fill.fore_color)
+    except (AttributeError, TypeError, NotImplementedError):
+        pass
+    return None
+
+
+def _line_rgb(shape):
+    try:
+        if shape.line.fill.type == MSO_FILL.SOLID:
+            return _rgb(shape.line.color)
+    except (AttributeError, TypeError, NotImplementedError):
+        pass
+    return None
+
+
+def _paragraphs(text_frame):
+    """[(text, size_pt, bold, rgb, align)] for each paragraph of a text frame."""
+    paragraphs = []
+    for p in text_frame.paragraphs:
+        run = p.runs[0] if p.runs else None
+        font = run.font if run is not None else p.font
+        size = font.size or p.font.size
+        paragraphs.append((
+            p.text,
+            size.pt if size is not None else DEFAULT_FONT_PT,
+            bool(font.bold if font.bold is not None else p.font.bold),
+            _rgb(font.color) or _rgb(p.font.color) or BLACK,
+            _ALIGN.get(p.alignment, 'left'),
+        ))
+    return paragraphs
+
+
+def _cell_fill(cell):
+    try:
+        return _fill_rgb(cell.fill)
+    except (AttributeError, TypeError):
+        return None
+
+
+def extract_shape_ops(shape, ops):
+    """Append the draw operations for one shape (recursing into groups)."""
+    if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+        for child in shape.shapes:
+            extract_shape_ops(child, ops)
+        return
+    if shape.left is None or shape.width is None:
+        return
+    box = (shape.left, shape.top, shape.width, shape.height)
+
+    if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
+        ops.append({'kind': 'image', 'box': box, 'blob': shape.image.blob})
+        return
+
+    if shape.has_table:
+        table = shape.table
+        col_widths = [c.width for c in table.columns]
+        row_heights = [r.height for r in table.rows]
+        cells = []
+        for r, row in enumerate(table.rows):
+            for c, cell in enumerate(row.cells):
+                cells.append((r, c, _cell_fill(cell), _paragraphs(cell.text_frame)))
+        ops.append({'kind': 'table', 'box': box, 'cols': col_widths,
+                    'rows': row_heights, 'cells': cells})
+        return
+
+    kind = 'rect'
+    anchor = 'top'
+    if shape.shape_type == MSO_SHAPE_TYPE.AUTO_SHAPE:
+        anchor = 'middle'
+        try:
+            if shape.auto_shape_type == MSO_SHAPE.ROUNDED_RECTANGLE:
+                kind = 'rounded'
+        except (AttributeError, ValueError, NotImplementedError):
+            pass
+    fill = _fill_rgb(shape.fill) if hasattr(shape, 'fill') else None
+    line = _line_rgb(shape) if hasattr(shape, 'line') else None
+    paragraphs = []
+    if shape.has_text_frame:
+        paragraphs = _paragraphs(shape.text_frame)
+        va = shape.text_frame.vertical_anchor
+        if va == MSO_ANCHOR.MIDDLE:
+            anchor = 'middle'
+        elif va == MSO_ANCHOR.BOTTOM:
+            anchor = 'bottom'
+        elif va == MSO_ANCHOR.TOP:
+            anchor = 'top'
+    if fill is None and line is None and not any(p[0] for p in paragraphs):
+        return
+    ops.append({'kind': kind, 'box': box, 'fill': fill, 'line': line,
+                'paragraphs': paragraphs, 'anchor': anchor})
+
+
+def extract_slide_ops(slide):
+    """Flatten a slide into (background_rgb, [draw operation])."""
+    background = None
+    try:
+        if slide.follow_master_background is False:
+            background = _fill_rgb(slide.background.fill)
+    except AttributeError:
+        pass
+    ops = []
+    for shape in slide.shapes:
+        extract_shape_ops(shape, ops)
+    return background or WHITE, ops
+
+
+# ═══════════════════════════════════════════════════
+# STEP 2: RENDER (runs in worker processes)
+# ═══════════════════════════════════════════════════
+
+@lru_cache(maxsize=None)
+def get_font(size_px, bold):
+    """Load a TrueType font once per (size, weight) in each worker."""
+    for candidate in FONT_CANDIDATES[bold]:
+        try:
+            return ImageFont.truetype(candidate, size_px)
+        except OSError:
+            continue
+    return ImageFont.load_default(size_px)
+
+
+def wrap_text(text, font, max_w):
+    """Greedy word wrap honouring explicit line breaks.
+
+    python-pptx reports <a:br/> line breaks inside a paragraph as '\\v'.
+    """
+    lines = []
+    for raw in re.split('[\n\v]', text):
+        words = raw.split(' ')
+        line = ''
+        for word in words:
+            candidate = f'{line} {word}' if line else word
+            if line and font.getlength(candidate) > max_w:
+                lines.append(line)
+                line = word
+            else:
+                line = candidate
+        lines.append(line)
+    return lines
+
+
+def draw_paragraphs(draw, paragraphs, x, y, w, h, scale, anchor, inset):
+    """Lay out and draw paragraphs inside the (x, y, w, h) pixel box."""
+    max_w = max(1, w - 2 * inset)
+    laid_out = []
+    total_h = 0
+    for text, size_pt, bold, color, align in paragraphs:
+        size_px = max(6, round(size_pt * 12700 * scale))
+        font = get_font(size_px, bold)
+        line_h = round(size_px * LINE_SPACING)
+        for line in wrap_text(text, font, max_w):
+            laid_out.append((line, font, color, align, line_h))
+            total_h += line_h
+
+    if anchor == 'middle':
+        cy = y + (h - total_h) / 2
+    elif anchor == 'bottom':
+        cy = y + h - inset - total_h
+    else:
+        cy = y + inset
+    for line, font, color, align, line_h in laid_out:
+        if line:
+            line_w = font.getlength(line)
+            if align == 'center':
+                lx = x + (w - line_w) / 2
+            elif align == 'right':
+                lx = x + w - inset - line_w
+            else:
+                lx = x + inset
+            draw.text((lx, cy), line, font=font, fill=color)
+        cy += line_h
+
+
+def render_slide(job):
+    """Render one flattened slide to PNG; returns the output path."""
+    path, slide_w, slide_h, background, ops = job
+    scale = THUMB_W / slide_w
+    img = Image.new('RGB', (THUMB_W, round(slide_h * scale)), background)
+    draw = ImageDraw.Draw(img)
+    inset = round(91440 * scale)   # python-pptx default 0.1" text inset
+
+    for op in ops:
+        left, top, width, height = (round(v * scale) for v in op['box'])
+        right, bottom = left + max(width, 1), top + max(height, 1)
+
+        if op['kind'] == 'image':
+            try:
+                pic = Image.open(io.BytesIO(op['blob'])).convert('RGBA')
+            except OSError:
+                continue
+            pic = pic.resize((max(width, 1), max(height, 1)))
+            img.paste(pic, (left, top), pic)
+
+        elif op['kind'] == 'table':
+            xs = [left]
+            for cw in op['cols']:
+                xs.append(xs[-1] + round(cw * scale))
+            ys = [top]
+            for rh in op['rows']:
+                ys.append(ys[-1] + round(rh * scale))
+            for r, c, fill, paragraphs in op['cells']:
+                if r + 1 >= len(ys) or c + 1 >= len(xs):
+                    continue
+                box = (xs[c], ys[r], xs[c + 1], ys[r + 1])
+                draw.rectangle(box, fill=fill, outline=(0xDD, 0xDD, 0xDD))
+                draw_paragraphs(draw, paragraphs, box[0], box[1], box[2] - box[0],
+                                box[3] - box[1], scale, 'middle', round(45720 * scale))
+
+        else:
+            if op['fill'] is not None or op['line'] is not None:
+                if op['kind'] == 'rounded':
+                    radius = round(min(width, height) * 0.16667)
+                    draw.rounded_rectangle((left, top, right, bottom), radius,
+                                           fill=op['fill'], outline=op['line'])
+                else:
+                    draw.rectangle((left, top, right, bottom),
+                                   fill=op['fill'], outline=op['line'])
+            draw_paragraphs(draw, op['paragraphs'], left, top, width, height,
+                            scale, op['anchor'], inset)
+
+    img.save(path)
+    return path
+
+
+# ═══════════════════════════════════════════════════
+# STEP 3: CONTACT SHEET
+# ═══════════════════════════════════════════════════
+
+def build_contact_sheet(png_paths, output_path):
+    """Tile slide PNGs into a numbered grid."""
+    thumbs = []
+    for path in png_paths:
+        with Image.open(path) as im:
+            ratio = SHEET_THUMB_W / im.width
+            thumbs.append(im.resize((SHEET_THUMB_W, round(im.height * ratio))))
+    if not thumbs:
+        return None
+
+    label_h = 20
+    cell_h = max(t.height for t in thumbs) + label_h
+    rows = (len(thumbs) + SHEET_COLS - 1) // SHEET_COLS
+    cols = min(SHEET_COLS, len(thumbs))
+    sheet = Image.new('RGB', (SHEET_GAP + cols * (SHEET_THUMB_W + SHEET_GAP),
+                              SHEET_GAP + rows * (cell_h + SHEET_GAP)), SHEET_BG)
+    draw = ImageDraw.Draw(sheet)
+    font = get_font(13, True)
+    for i, thumb in enumerate(thumbs):
+        x = SHEET_GAP + (i % SHEET_COLS) * (SHEET_THUMB_W + SHEET_GAP)
+        y = SHEET_GAP + (i // SHEET_COLS) * (cell_h + SHEET_GAP)
+        draw.text((x, y), str(i + 1), font=font, fill=LABEL_COLOR)
+        sheet.paste(thumb, (x, y + label_h))
+    sheet.save(output_path)
+    return output_path
+
+
+# ═══════════════════════════════════════════════════
+# MAIN
+# ═══════════════════════════════════════════════════
+
+def preview_names(deck_paths):
+    """Output name per deck: the file name, prefixed with its parent folder
+    when several decks share it, and numbered if that still collides."""
+    stems = [os.path.splitext(os.path.basename(p))[0] for p in deck_paths]
+    names = []
+    for path, stem in zip(deck_paths, stems):
+        if stems.count(stem) > 1:
+            parent = os.path.basename(os.path.dirname(os.path.abspath(path)))
+            stem = f'{parent}-{stem}' if parent else stem
+        name, n = stem, 2
+        while name in names:
+            name = f'{stem}-{n}'
+            n += 1
+        names.append(name)
+    return names
+
+
+def deck_jobs(deck_path, name, out_dir):
+    """Flatten every slide of a deck into render jobs."""
+    prs = Presentation(deck_path)
+    slide_dir = os.path.join(out_dir, name)
+    os.makedirs(slide_dir, exist_ok=True)
+    jobs = []
+    for i, slide in enumerate(prs.slides, 1):
+        background, ops = extract_slide_ops(slide)
+        png = os.path.join(slide_dir, f'slide-{i:02d}.png')
+        jobs.append((png, prs.slide_width, prs.slide_height, background, ops))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render PNG previews of .pptx decks.')
+    parser.add_argument('decks', nargs='+', help='.pptx files to render')
+    parser.add_argument('-o', '--out', default='deck-previews', help='output directory')
+    parser.add_argument('-j', '--jobs', type=int, default=None,
+                        help='worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for deck, name in zip(args.decks, preview_names(args.decks)):
+            print(f"\U0001F5BC  {deck}")
+            jobs = deck_jobs(deck, name, args.out)
+            pngs = list(pool.map(render_slide, jobs))
+            sheet = build_contact_sheet(pngs, os.path.join(args.out, f'{name}-contact.png'))
+            print(f"   {len(pngs)} slides \u2192 {sheet}")
+
+    print(f"\n\u2705 Previews written to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,8 +10,20 @@ from pptx.util import Inches, Pt, Emu
 from pptx.dml.color import RGBColor
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from functools import lru_cache
+from xml.sax.saxutils import escape
+import argparse
 import copy
+import hashlib
+import json
 import os
+import sys
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pptx_text import iter_text_runs
 
 # ═══════════════════════════════════════════════════
 # CONSTANTS
@@ -37,6 +49,136 @@ SLIDE_H = Emu(5143500)
 MARGIN = Emu(457200)  # 0.5 inch
 CONTENT_W = Emu(8229600)
 
+# Localization: slide texts are written in French and resolved per deck
+# language through the translation memory below.
+SOURCE_LANG = 'fr'
+DECK_LANGS = ('fr', 'pt', 'en')
+TM_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data',
+                       'deck-translation-memory.json')
+
+
+# ═══════════════════════════════════════════════════
+# LOCALIZATION
+# ═══════════════════════════════════════════════════
+
+def string_key(text):
+    """Stable short key identifying a source string."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]
+
+
+def normalize_text(text):
+    """Fold case, accents and whitespace so near-identical strings match."""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(text.casefold().split())
+
+
+class TranslationMemory:
+    """FR -> target language lookups backed by a JSON translation memory.
+
+    The memory file maps each language to {french source: translation}.
+    Strings are looked up by exact source first, then by the hash of their
+    normalized form. Lookup results, misses included, are cached on disk per
+    language keyed by string_key(): a hit remembers which memory entry it
+    came from, a miss remembers its normalized hash. When the memory file
+    changes, only the hits whose entry was edited or removed and the misses
+    an added or edited entry could now resolve are dropped, so a
+    regeneration only hits the memory for new or edited strings.
+    Strings without a translation keep their French text and are collected
+    in `missing` for a single report at the end of the run.
+    """
+
+    def __init__(self, path, lang):
+        self.path = path
+        self.lang = lang
+        self.cache_path = f'{os.path.splitext(path)[0]}.{lang}.cache.json'
+        self.exact = {}
+        self.cache = {}       # key -> [translation or None, entry key or normalized hash]
+        self.strings = {}
+        self.missing = {}
+        self.lookups = 0
+        self._normalized = None
+        self._cache_dirty = False
+
+        self.tm_mtime = os.path.getmtime(path) if os.path.exists(path) else 0
+        if self.tm_mtime:
+            with open(path, encoding='utf-8') as f:
+                self.exact = json.load(f).get(lang, {})
+        # One hash per memory entry, to tell which ones changed between runs
+        self.tm_hashes = {string_key(src): string_key(dst or '')
+                          for src, dst in self.exact.items()}
+
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, encoding='utf-8') as f:
+                cached = json.load(f)
+            # Caches without per-entry hashes predate this format: start over
+            entries = cached.get('entries', {}) if 'tm_hashes' in cached else {}
+            if cached.get('tm_mtime') == self.tm_mtime:
+                self.cache = entries
+            else:
+                old = cached.get('tm_hashes', {})
+                changed = {k for k in old.keys() | self.tm_hashes.keys()
+                           if old.get(k) != self.tm_hashes.get(k)}
+                changed_norm = {string_key(normalize_text(src)) for src, dst in self.exact.items()
+                                if dst and string_key(src) in changed}
+                # A changed entry keyed like the string itself may now be an
+                # exact match for a string previously resolved by normalization
+                self.cache = {k: v for k, v in entries.items()
+                              if k not in changed and v[1] not in changed
+                              and (v[0] or v[1] not in changed_norm)}
+                self._cache_dirty = True
+
+    def _normalized_index(self):
+        if self._normalized is None:
+            self._normalized = {string_key(normalize_text(src)): (string_key(src), dst)
+                                for src, dst in self.exact.items() if dst}
+        return self._normalized
+
+    def translate(self, text):
+        """Return the translation of `text`, or `text` itself if unknown."""
+        if not text or not any(c.isalpha() for c in text):
+            return text
+        key = string_key(text)
+        self.strings[key] = text
+        if self.lang == SOURCE_LANG:
+            return text
+        if key not in self.cache:
+            self.lookups += 1
+            if self.exact.get(text):
+                self.cache[key] = [self.exact[text], key]
+            else:
+                norm = string_key(normalize_text(text))
+                match = self._normalized_index().get(norm)
+                self.cache[key] = [match[1], match[0]] if match else [None, norm]
+            self._cache_dirty = True
+        target = self.cache[key][0]
+        if not target:
+            self.missing[key] = text
+            return text
+        return target
+
+    def save_cache(self):
+        if not self._cache_dirty:
+            return
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump({'tm_mtime': self.tm_mtime, 'tm_hashes': self.tm_hashes,
+                       'entries': self.cache}, f, ensure_ascii=False, indent=1)
+        self._cache_dirty = False
+
+    def write_missing(self, path):
+        """Write missing strings in memory-file format, ready to be filled in."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({self.lang: {src: '' for src in self.missing.values()}}, f,
+                      ensure_ascii=False, indent=2)
+
+
+TRANSLATOR = None
+
+
+def _t(text):
+    """Localize a slide string through the active translation memory."""
+    return TRANSLATOR.translate(text) if TRANSLATOR else text
+
 
 # ═══════════════════════════════════════════════════
 # HELPER FUNCTIONS
@@ -49,7 +191,7 @@ def add_textbox(slide, left, top, width, height, text, font_size=14, bold=False,
     tf = txBox.text_frame
     tf.word_wrap = True
     p = tf.paragraphs[0]
-    p.text = text
+    p.text = _t(text)
     p.font.size = Pt(font_size)
     p.font.bold = bold
     p.font.color.rgb = color
@@ -75,7 +217,7 @@ def add_shape_with_text(slide, left, top, width, height, text, font_size=14,
     tf.word_wrap = True
     tf.auto_size = None
     p = tf.paragraphs[0]
-    p.text = text
+    p.text = _t(text)
     p.font.size = Pt(font_size)
     p.font.bold = bold
     p.font.color.rgb = text_color
@@ -106,7 +248,7 @@ def add_multi_text(slide, left, top, width, height, lines, fill_color=None):
             p = tf.paragraphs[0]
         else:
             p = tf.add_paragraph()
-        p.text = text
+        p.text = _t(text)
         p.font.size = Pt(size)
         p.font.bold = bold
         p.font.color.rgb = color
@@ -136,7 +278,7 @@ def add_stat_box(slide, left, top, width, height, number, label, source,
 
     # Number
     p = tf.paragraphs[0]
-    p.text = number
+    p.text = _t(number)
     p.font.size = Pt(22)
     p.font.bold = True
     p.font.color.rgb = num_color
@@ -145,7 +287,7 @@ def add_stat_box(slide, left, top, width, height, number, label, source,
 
     # Label
     p2 = tf.add_paragraph()
-    p2.text = label
+    p2.text = _t(label)
     p2.font.size = Pt(11)
     p2.font.bold = True
     p2.font.color.rgb = DARK_TEXT
@@ -155,7 +297,7 @@ def add_stat_box(slide, left, top, width, height, number, label, source,
 
     # Source
     p3 = tf.add_paragraph()
-    p3.text = source
+    p3.text = _t(source)
     p3.font.size = Pt(7)
     p3.font.color.rgb = GRAY
     p3.font.name = 'Arial'
@@ -175,7 +317,7 @@ def add_dark_banner(slide, top, text, font_size=16, color=WHITE, bg=DARK_BLUE):
     tf = shape.text_frame
     tf.word_wrap = True
     p = tf.paragraphs[0]
-    p.text = text
+    p.text = _t(text)
     p.font.size = Pt(font_size)
     p.font.bold = True
     p.font.color.rgb = color
@@ -184,6 +326,152 @@ def add_dark_banner(slide, top, text, font_size=16, color=WHITE, bg=DARK_BLUE):
     return shape
 
 
+# ═══════════════════════════════════════════════════
+# NATIVE TABLES
+# ═══════════════════════════════════════════════════
+# Filling a python-pptx table cell by cell goes through several proxy objects
+# per run, which gets slow on long listings. These helpers emit the whole
+# <p:graphicFrame><a:tbl> in one string and parse it once.
+
+TABLE_HEADER_BG = DARK_BLUE
+TABLE_ZEBRA_BG = (RGBColor(0xFF, 0xFF, 0xFF), RGBColor(0xF1, 0xF3, 0xF5))
+TABLE_ROW_H = Emu(246888)     # 0.27 inch
+TABLE_CELL_MARGIN = Emu(45720)
+TABLE_CONTENT_TOP = Emu(1188720)
+
+_ALIGN_ATTR = {PP_ALIGN.LEFT: 'l', PP_ALIGN.CENTER: 'ctr', PP_ALIGN.RIGHT: 'r'}
+
+
+@lru_cache(maxsize=None)
+def _table_cell_style(font_size, bold, color, fill, alignment, font_name):
+    """Return the (pPr, rPr, tcPr) XML fragments for one cell style.
+
+    Colors are passed as hex strings so the arguments stay hashable; a table
+    only ever uses a handful of styles, so each one is serialised once.
+    """
+    ppr = f'<a:pPr algn="{_ALIGN_ATTR.get(alignment, "l")}"/>'
+    rpr = (f'<a:rPr sz="{int(font_size * 100)}" b="{1 if bold else 0}" dirty="0">'
+           f'<a:solidFill><a:srgbClr val="{color}"/></a:solidFill>'
+           f'<a:latin typeface="{escape(font_name, {chr(34): "&quot;"})}"/></a:rPr>')
+    m = int(TABLE_CELL_MARGIN)
+    tcpr = (f'<a:tcPr marL="{m}" marR="{m}" marT="0" marB="0" anchor="ctr">'
+            f'<a:solidFill><a:srgbClr val="{fill}"/></a:solidFill></a:tcPr>')
+    return ppr, rpr, tcpr
+
+
+def _table_cell_xml(value, font_size, bold, color, fill, alignment, font_name):
+    """Serialise one <a:tc>. `value` is a str or a (text, bold, color) tuple."""
+    if isinstance(value, tuple):
+        value, bold, color = value
+    ppr, rpr, tcpr = _table_cell_style(font_size, bold, str(color), str(fill),
+                                       alignment, font_name)
+    return (f'<a:tc><a:txBody><a:bodyPr/><a:lstStyle/><a:p>{ppr}'
+            f'<a:r>{rpr}<a:t>{escape(_t(str(value)))}</a:t></a:r></a:p></a:txBody>{tcpr}</a:tc>')
+
+
+def _table_graphic_frame_xml(shape_id, left, top, col_widths, row_h, header, rows,
+                             font_size, header_font_size, text_color, alignments,
+                             font_name):
+    """Build the complete <p:graphicFrame> holding an <a:tbl>."""
+    parts = []
+    if header:
+        parts.append(f'<a:tr h="{int(row_h)}">')
+        for value, align in zip(header, alignments):
+            parts.append(_table_cell_xml(value, header_font_size, True, WHITE,
+                                         TABLE_HEADER_BG, align, font_name))
+        parts.append('</a:tr>')
+    for i, row in enumerate(rows):
+        fill = TABLE_ZEBRA_BG[i % 2]
+        parts.append(f'<a:tr h="{int(row_h)}">')
+        for value, align in zip(row, alignments):
+            parts.append(_table_cell_xml(value, font_size, False, text_color,
+                                         fill, align, font_name))
+        parts.append('</a:tr>')
+
+    grid = ''.join(f'<a:gridCol w="{int(w)}"/>' for w in col_widths)
+    n_rows = len(rows) + (1 if header else 0)
+    return (
+        f'<p:graphicFrame {nsdecls("a", "p")}>'
+        f'<p:nvGraphicFramePr><p:cNvPr id="{shape_id}" name="Table {shape_id}"/>'
+        f'<p:cNvGraphicFramePr><a:graphicFrameLocks noGrp="1"/></p:cNvGraphicFramePr>'
+        f'<p:nvPr/></p:nvGraphicFramePr>'
+        f'<p:xfrm><a:off x="{int(left)}" y="{int(top)}"/>'
+        f'<a:ext cx="{int(sum(col_widths))}" cy="{int(row_h) * n_rows}"/></p:xfrm>'
+        f'<a:graphic><a:graphicData uri="http://schemas.openxmlformats.org/drawingml/2006/table">'
+        f'<a:tbl><a:tblPr firstRow="{1 if header else 0}" bandRow="1"/>'
+        f'<a:tblGrid>{grid}</a:tblGrid>{"".join(parts)}</a:tbl>'
+        f'</a:graphicData></a:graphic></p:graphicFrame>'
+    )
+
+
+def add_table(prs, slide, left, top, width, rows=None, columns=None, header=None,
+              col_widths=None, row_h=TABLE_ROW_H, bottom=None, font_size=11,
+              header_font_size=None, text_color=DARK_TEXT, alignments=None,
+              font_name='Arial', continuation_title=None):
+    """Add a native table built in a single XML pass, paging onto new slides.
+
+    Data is given either row-wise (`rows`, a list of sequences) or column-wise
+    (`columns`, a list of equal-length sequences). A cell is a plain string or
+    a (text, bold, color) tuple to emphasise it. Body rows are zebra-striped
+    and the header is repeated on every page.
+
+    Rows that do not fit above `bottom` move to continuation slides, added
+    right after `slide`, titled `continuation_title` and laid out from
+    TABLE_CONTENT_TOP. Returns the list of slides the table spans.
+    """
+    if columns is not None:
+        if len({len(c) for c in columns}) > 1:
+            raise ValueError(f'columns have different lengths: {[len(c) for c in columns]}')
+        rows = list(zip(*columns))
+    rows = [tuple(r) for r in rows or []]
+    n_cols = len(header) if header else max((len(r) for r in rows), default=0)
+    if not n_cols:
+        return [slide]
+    for i, row in enumerate(rows):
+        if len(row) > n_cols:
+            raise ValueError(f'row {i} has {len(row)} cells, table has {n_cols} columns')
+    # Every <a:tr> needs one <a:tc> per <a:gridCol> or PowerPoint repairs the file
+    rows = [row + ('',) * (n_cols - len(row)) for row in rows]
+
+    if col_widths is None:
+        col_widths = [int(width) // n_cols] * n_cols
+    elif len(col_widths) != n_cols:
+        raise ValueError(f'{len(col_widths)} col_widths for {n_cols} columns')
+    if alignments is None:
+        alignments = [PP_ALIGN.LEFT] + [PP_ALIGN.RIGHT] * (n_cols - 1)
+    elif len(alignments) != n_cols:
+        raise ValueError(f'{len(alignments)} alignments for {n_cols} columns')
+    if header_font_size is None:
+        header_font_size = font_size
+    if bottom is None:
+        bottom = SLIDE_H - MARGIN
+
+    header_rows = 1 if header else 0
+    slides = []
+    start = 0
+    while True:
+        per_page = max(1, (int(bottom) - int(top)) // int(row_h) - header_rows)
+        chunk = rows[start:start + per_page]
+        shape_id = slide.shapes._next_shape_id
+        xml = _table_graphic_frame_xml(shape_id, left, top, col_widths, row_h, header,
+                                       chunk, font_size, header_font_size, text_color,
+                                       alignments, font_name)
+        slide.shapes._spTree.append(parse_xml(xml))
+        slides.append(slide)
+
+        start += per_page
+        if start >= len(rows):
+            return slides
+
+        previous = slide
+        slide = prs.slides.add_slide(prs.slide_layouts[0])
+        move_slide(prs, len(prs.slides) - 1, prs.slides.index(previous) + 1)
+        if continuation_title:
+            add_textbox(slide, MARGIN, Emu(274320), CONTENT_W, Emu(548640),
+                        continuation_title, 28, True, DARK_TEXT, PP_ALIGN.CENTER, 'Arial Black')
+        top = TABLE_CONTENT_TOP
+
+
 # ═══════════════════════════════════════════════════
 # STEP 1: FIND & REPLACE FIXIT → VITFIX
 # ═══════════════════════════════════════════════════
@@ -204,28 +492,13 @@ def replace_text_in_presentation(prs):
     }
 
     count = 0
-    for slide in prs.slides:
-        for shape in slide.shapes:
-            if shape.has_text_frame:
-                for paragraph in shape.text_frame.paragraphs:
-                    for run in paragraph.runs:
-                        original = run.text
-                        for old, new in replacements.items():
-                            if old in run.text:
-                                run.text = run.text.replace(old, new)
-                        if run.text != original:
-                            count += 1
-            if shape.has_table:
-                for row in shape.table.rows:
-                    for cell in row.cells:
-                        for paragraph in cell.text_frame.paragraphs:
-                            for run in paragraph.runs:
-                                original = run.text
-                                for old, new in replacements.items():
-                                    if old in run.text:
-                                        run.text = run.text.replace(old, new)
-                                if run.text != original:
-                                    count += 1
+    for _, _, _, run in iter_text_runs(prs):
+        original = run.text
+        for old, new in replacements.items():
+            if old in run.text:
+                run.text = run.text.replace(old, new)
+        if run.text != original:
+            count += 1
     return count
 
 
@@ -241,25 +514,25 @@ def update_slide2_problem(slide):
                 for run in para.runs:
                     # Update specific stats with verified ones
                     if 'Trouver un artisan fiable = 3h de recherche' in run.text:
-                        run.text = '• 39% des particuliers ne trouvent pas d\'artisan fiable (OpinionWay 2025)'
+                        run.text = _t('• 39% des particuliers ne trouvent pas d\'artisan fiable (OpinionWay 2025)')
                     elif 'Délai d\'intervention : 5-10 jours' in run.text:
-                        run.text = '• 25% des Français craignent les arnaques (OpinionWay 2025)'
+                        run.text = _t('• 25% des Français craignent les arnaques (OpinionWay 2025)')
                     elif 'Prix opaques, devis non comparables' in run.text:
-                        run.text = '• 33% redoutent les malfacons (OpinionWay 2025)'
+                        run.text = _t('• 33% redoutent les malfacons (OpinionWay 2025)')
                     elif 'Risque d\'arnaque, travaux mal faits' in run.text:
-                        run.text = '• Satisfaction artisans : seulement 55% en Ile-de-France (BVA)'
+                        run.text = _t('• Satisfaction artisans : seulement 55% en Ile-de-France (BVA)')
                     elif 'Temps perdu coordination : 15h/semaine' in run.text:
-                        run.text = '• 71,5% des entreprises peinent a recruter (France Travail 2024)'
+                        run.text = _t('• 71,5% des entreprises peinent a recruter (France Travail 2024)')
                     elif 'Litiges interventions : 40% des cas' in run.text:
-                        run.text = '• 485 000 postes vacants dans le BTP (FFB 2024)'
+                        run.text = _t('• 485 000 postes vacants dans le BTP (FFB 2024)')
                     elif 'Facturation éparpillée' in run.text:
-                        run.text = '• 30% des artisans sous-digitalises (PlanRadar 2024)'
+                        run.text = _t('• 30% des artisans sous-digitalises (PlanRadar 2024)')
                     elif 'Pas de traçabilité' in run.text:
-                        run.text = '• 2 millions de degats des eaux/an (France Assureurs 2024)'
+                        run.text = _t('• 2 millions de degats des eaux/an (France Assureurs 2024)')
                     elif 'Clients/Locataires insatisfaits' in run.text:
-                        run.text = '• 4 160 sinistres/jour = besoin artisans constant'
+                        run.text = _t('• 4 160 sinistres/jour = besoin artisans constant')
                     elif 'COÛT CACHÉ : 5 000' in run.text:
-                        run.text = '\U0001F525 COUT TOTAL : 2,4 Md\u20AC/an d\'indemnisations degats des eaux seuls (France Assureurs 2024)'
+                        run.text = _t('\U0001F525 COUT TOTAL : 2,4 Md\u20AC/an d\'indemnisations degats des eaux seuls (France Assureurs 2024)')
 
 
 def update_slide5_copro(slide):
@@ -269,7 +542,7 @@ def update_slide5_copro(slide):
             for para in shape.text_frame.paragraphs:
                 for run in para.runs:
                     if '500+ artisans vérifiés' in run.text:
-                        run.text = '\u2705 Reseau d\'artisans verifies (SIRET + assurance)'
+                        run.text = _t('\u2705 Reseau d\'artisans verifies (SIRET + assurance)')
 
 
 def update_slide4_segments(slide):
@@ -279,9 +552,9 @@ def update_slide4_segments(slide):
             for para in shape.text_frame.paragraphs:
                 for run in para.runs:
                     if '750K unités' in run.text:
-                        run.text = '873K immeubles'
+                        run.text = _t('873K immeubles')
                     elif '8M+ UNITÉS' in run.text:
-                        run.text = '13M+ DE LOGEMENTS A ADRESSER'
+                        run.text = _t('13M+ DE LOGEMENTS A ADRESSER')
 
 
 # ═══════════════════════════════════════════════════
@@ -378,19 +651,24 @@ def create_slide_demande_digitale(prs):
                         '\U0001F50D VOLUMES DE RECHERCHE MENSUELS (France)',
                         14, True, WHITE, RGBColor(0x15, 0x65, 0xC0), PP_ALIGN.CENTER)
 
-    keywords_lines = [
-        ('\U0001F527 serrurier : 53 000 rech/mois', 12, True, DEEP_ORANGE),
-        ('\U0001F527 plombier : 35 000 rech/mois', 12, True, DEEP_ORANGE),
-        ('\U0001F4A7 fuite d\'eau : 33 000 rech/mois', 12, False, DARK_TEXT),
-        ('\U0001F3E2 syndic copropriete : 25 000 rech/mois', 12, False, DARK_TEXT),
-        ('\u26A1 electricien : 25 000 rech/mois', 12, False, DARK_TEXT),
-        ('\U0001F3D7 couvreur : 18 000 rech/mois', 12, False, DARK_TEXT),
-        ('\U0001F333 paysagiste : 16 000 rech/mois', 12, False, DARK_TEXT),
-        ('\U0001F50E avis artisan : 12 000 rech/mois (+60%)', 12, False, GREEN),
-        ('\U0001F4DD devis artisan : 8 000 rech/mois', 12, False, DARK_TEXT),
-        ('Source : Ahrefs (nov. 2024) via plaqueplastique.fr', 8, False, GRAY),
+    keyword_rows = [
+        (('\U0001F527 serrurier', True, DEEP_ORANGE), ('53 000', True, DEEP_ORANGE), ''),
+        (('\U0001F527 plombier', True, DEEP_ORANGE), ('35 000', True, DEEP_ORANGE), ''),
+        ('\U0001F4A7 fuite d\'eau', '33 000', ''),
+        ('\U0001F3E2 syndic copropriete', '25 000', ''),
+        ('\u26A1 electricien', '25 000', ''),
+        ('\U0001F3D7 couvreur', '18 000', ''),
+        ('\U0001F333 paysagiste', '16 000', ''),
+        (('\U0001F50E avis artisan', False, GREEN), ('12 000', False, GREEN), ('+60%', True, GREEN)),
+        ('\U0001F4DD devis artisan', '8 000', ''),
     ]
-    add_multi_text(slide, left_x, Emu(1600200), left_w, Emu(2743200), keywords_lines)
+    add_table(prs, slide, left_x, Emu(1600200), left_w, keyword_rows,
+              header=('Mot-cle', 'Rech/mois', 'Tendance'),
+              col_widths=[Emu(2468880), Emu(914400), Emu(731520)],
+              bottom=Emu(4114800), font_size=11,
+              continuation_title='\U0001F4C8 VOLUMES DE RECHERCHE (suite)')
+    add_textbox(slide, left_x, Emu(4114800), left_w, Emu(228600),
+                'Source : Ahrefs (nov. 2024) via plaqueplastique.fr', 8, False, GRAY)
 
     # Right column: Trends explosion
     right_x = Emu(4754880)
@@ -642,7 +920,24 @@ def move_slide(prs, old_index, new_index):
 # MAIN
 # ═══════════════════════════════════════════════════
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Build the Vitfix investor deck.')
+    parser.add_argument('--lang', choices=DECK_LANGS, default=SOURCE_LANG,
+                        help='deck language (default: fr)')
+    parser.add_argument('--tm', default=TM_FILE, help='translation memory JSON file')
+    parser.add_argument('--extract', metavar='PATH',
+                        help='also write every generated string as {key: source} to PATH')
+    return parser.parse_args()
+
+
 def main():
+    global TRANSLATOR
+    args = parse_args()
+    TRANSLATOR = TranslationMemory(args.tm, args.lang)
+    output_file = OUTPUT_FILE
+    if args.lang != SOURCE_LANG:
+        output_file = f'{os.path.splitext(OUTPUT_FILE)[0]}-{args.lang.upper()}.pptx'
+
     print("\U0001F4E6 Loading presentation...")
     prs = Presentation(INPUT_FILE)
 
@@ -707,6 +1002,18 @@ def main():
     xml_slides = prs.slides._sldIdLst
     slides_list = list(xml_slides)
 
+    # New slides may page tables onto continuation slides, which sit right
+    # after the slide that created them: group each created slide with its
+    # continuations so the order below stays one entry per section.
+    created_ids = {s.slide_id for s in (slide_marche, slide_penurie, slide_digitale,
+                                        slide_chiffres, slide_opportunite)}
+    groups = [[el] for el in slides_list[:original_count]]
+    for el in slides_list[original_count:]:
+        if el.id in created_ids or len(groups) == original_count:
+            groups.append([el])
+        else:
+            groups[-1].append(el)
+
     # Build new order by index
     # Original indices: 0-13, new: 14(marche), 15(penurie), 16(digitale), 17(chiffres), 18(opportunite)
     new_order = [
@@ -735,17 +1042,34 @@ def main():
     for el in slides_list:
         xml_slides.remove(el)
     for idx in new_order:
-        xml_slides.append(slides_list[idx])
+        for el in groups[idx]:
+            xml_slides.append(el)
 
-    print(f"   {len(new_order)} slides reordered")
+    print(f"   {len(slides_list)} slides reordered")
 
     # Save
-    print(f"\n\U0001F4BE Saving to {OUTPUT_FILE}...")
-    prs.save(OUTPUT_FILE)
+    print(f"\n\U0001F4BE Saving to {output_file}...")
+    prs.save(output_file)
+
+    # Step 5: Localization report
+    TRANSLATOR.save_cache()
+    if args.extract:
+        with open(args.extract, 'w', encoding='utf-8') as f:
+            json.dump(TRANSLATOR.strings, f, ensure_ascii=False, indent=2)
+        print(f"\n\U0001F4DD {len(TRANSLATOR.strings)} strings extracted to {args.extract}")
+    if args.lang != SOURCE_LANG:
+        print(f"\n\U0001F310 {args.lang.upper()}: {TRANSLATOR.lookups} translation memory lookups")
+        missing_file = f'{os.path.splitext(output_file)[0]}.missing.json'
+        if TRANSLATOR.missing:
+            TRANSLATOR.write_missing(missing_file)
+            print(f"   \u26A0\uFE0F {len(TRANSLATOR.missing)} strings left in French, see {missing_file}")
+        elif os.path.exists(missing_file):
+            # Everything is translated now: drop the previous run's batch
+            os.remove(missing_file)
 
     final_count = len(prs.slides)
     print(f"\n\u2705 Done! {final_count} slides total ({final_count - original_count} new slides added)")
-    print(f"\U0001F4C4 Output: {OUTPUT_FILE}")
+    print(f"\U0001F4C4 Output: {output_file}")
 
 
 if __name__ == '__main__':